@@ -1,3 +1,5 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,12 +8,15 @@ from sqlalchemy.future import select
 from app.core.exceptions import (InvalidCredentialsException,
                                  UserNotFoundException)
 from app.core.security import (create_access_token, get_password_hash,
+                               password_needs_rehash, verify_dummy_password,
                                verify_password)
 from app.db.database import get_db
 from app.db.models import User
 from app.schemas.token import Token
 from app.schemas.user import UserCreate, UserOut
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
@@ -23,23 +28,23 @@ async def register_user(user_in: UserCreate, db: AsyncSession = Depends(get_db))
     - Checks if a user with the given email already exists.
     """
     # Check if user already exists
-    result = await db.execute(select(User).where(User.email == user_in.email))
-    existing_user = result.scalar_one_or_none()
+    existing_user = await db.scalar(
+        select(User).where(User.email == user_in.email).limit(1)
+    )
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
     # Hash the password
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash(user_in.password)
 
     # Create new user
     new_user = User(email=user_in.email, hashed_password=hashed_password)
     db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
 
-    print(f"User registered: {new_user.email}")
+    logger.debug("User registered: %s", new_user.email)
     return new_user
 
 
@@ -51,13 +56,25 @@ async def login_for_access_token(
     Authenticates a user and returns a JWT access token.
     Uses OAuth2PasswordRequestForm for standard username/password login.
     """
-    result = await db.execute(select(User).where(User.email == form_data.username))
-    user = result.scalar_one_or_none()
+    user = await db.scalar(
+        select(User).where(User.email == form_data.username).limit(1)
+    )
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user:
+        # Do the same hashing work as for a real user to avoid a timing oracle
+        await verify_dummy_password(form_data.password)
         raise InvalidCredentialsException()
+    if not await verify_password(form_data.password, user.hashed_password):
+        raise InvalidCredentialsException()
+
+    # Upgrade legacy hashes (e.g. bcrypt) to the current scheme
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash(form_data.password)
+        await db.commit()
 
     # Create access token
-    access_token = create_access_token(data={"sub": user.email, "id": user.id})
-    print(f"User logged in: {user.email}")
+    access_token = create_access_token(
+        data={"sub": user.email, "id": user.id, "is_active": user.is_active}
+    )
+    logger.debug("User logged in: %s", user.email)
     return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+
+from app.db.database import engine
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+@router.get("/pool")
+async def get_pool_status():
+    """
+    Returns the database connection pool status, for spotting pool saturation.
+    Only mounted when ENABLE_DEBUG_ENDPOINTS is set.
+    """
+    pool = engine.pool
+    return {
+        "status": pool.status(),
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
@@ -1,31 +1,89 @@
+import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import delete, exists, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from app.core.exceptions import (DatabaseOperationException,
                                  DocumentNotFoundException,
                                  DocumentProcessingException,
                                  ForbiddenException)
-from app.core.security import get_current_active_user
+from app.core.security import (get_current_active_user,
+                               get_current_verified_user)
 from app.db.database import get_db
-from app.db.models import Document, DocumentChunk, User
-from app.schemas.document import (DocumentChunkOut, DocumentCreate,
+from app.db.models import Document, DocumentChunk
+from app.schemas.document import (DocumentChunkListAdapter, DocumentChunkOut,
+                                  DocumentCreate, DocumentListAdapter,
                                   DocumentOut, DocumentUpdate)
+from app.schemas.token import TokenData
 from app.services.document_processor import document_processor
 from app.services.mock_doc_system import mock_document_system
 from app.services.vector_store import mock_vector_store
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
 
+def _embed_chunks(chunks: List[str]) -> List[str]:
+    """
+    Generates and stores embeddings for a list of chunks in one batch,
+    returning the embedding IDs in chunk order.
+    """
+    vectors = mock_vector_store.generate_mock_embeddings(chunks)
+    return mock_vector_store.add_embeddings(vectors)
+
+
+def _delete_embeddings(embedding_ids: List[str]) -> None:
+    """
+    Deletes a batch of embeddings from the vector store.
+    """
+    if embedding_ids:
+        mock_vector_store.delete_embeddings(embedding_ids)
+
+
+def _list_response(adapter: TypeAdapter, rows: List[Any]) -> Response:
+    """
+    Validates and serializes ORM rows to JSON with a prebuilt TypeAdapter.
+    Returning a Response directly skips FastAPI's per-request response_model
+    processing; the route's response_model still documents the schema.
+    """
+    items = adapter.validate_python(rows, from_attributes=True)
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+
+async def _insert_chunks(
+    db: AsyncSession, document_id: int, chunks: List[str], embedding_ids: List[str]
+) -> None:
+    """
+    Inserts all chunk rows for a document in a single executemany INSERT
+    instead of one INSERT per chunk.
+    """
+    if not chunks:
+        return
+    await db.execute(
+        insert(DocumentChunk),
+        [
+            {
+                "document_id": document_id,
+                "chunk_text": chunk_text,
+                "chunk_order": i,
+                "embedding_id": embedding_id,
+            }
+            for i, (chunk_text, embedding_id) in enumerate(zip(chunks, embedding_ids))
+        ],
+    )
+
+
 @router.post("/", response_model=DocumentOut, status_code=status.HTTP_201_CREATED)
 async def create_document(
     doc_in: DocumentCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenData = Depends(get_current_verified_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -33,57 +91,44 @@ async def create_document(
     processes its content for AI context (chunks), and stores embeddings.
     """
     try:
-        # 1. Upload to mock document system
-        mock_doc_data = await mock_document_system.upload_document(
+        # External IO runs before any SQL so the pooled connection is only
+        # held for the database writes below.
+        # 1. Upload to mock document system and extract text
+        mock_doc_data = mock_document_system.upload_document(
             title=doc_in.title, content=doc_in.content
         )
         mock_system_id = mock_doc_data["mock_system_id"]
+        extracted_text = await document_processor.extract_text(doc_in.content)
+
+        # 2. Process document for AI context (chunking)
+        chunks = await document_processor.chunk_text(extracted_text)
 
-        # 2. Create document metadata in PostgreSQL
+        # 3. Generate and store vector embeddings
+        embedding_ids = _embed_chunks(chunks)
+
+        # 4. Create document metadata and chunks in PostgreSQL
         db_document = Document(
             title=doc_in.title,
             content=doc_in.content,
             owner_id=current_user.id,
             mock_system_id=mock_system_id,
-            processed_at=None,  # Will be updated after processing
+            processed_at=datetime.now(),
         )
         db.add(db_document)
-        await db.flush()  # Flush to get the document ID before committing
-
-        # 3. Process document for AI context (text extraction and chunking)
-        extracted_text = await document_processor.extract_text(doc_in.content)
-        chunks = await document_processor.chunk_text(extracted_text)
+        await db.flush()  # Flush to get the document ID before inserting chunks
+        await _insert_chunks(db, db_document.id, chunks, embedding_ids)
 
-        # 4. Store chunks and vector embeddings
-        for i, chunk_text in enumerate(chunks):
-            # Generate mock embedding
-            embedding_vector = await mock_vector_store.generate_mock_embedding(
-                chunk_text
-            )
-            embedding_id = await mock_vector_store.add_embedding(embedding_vector)
-
-            db_chunk = DocumentChunk(
-                document_id=db_document.id,
-                chunk_text=chunk_text,
-                chunk_order=i,
-                embedding_id=embedding_id,
-            )
-            db.add(db_chunk)
-
-        # Update document processed_at timestamp
-        db_document.processed_at = datetime.now()
         await db.commit()
-        await db.refresh(
-            db_document
-        )  # Refresh to get updated processed_at and relationships
 
-        print(
-            f"Document '{doc_in.title}' created and processed for user {current_user.email}"
+        logger.debug(
+            "Document '%s' created and processed for user %s",
+            doc_in.title,
+            current_user.email,
         )
         return db_document
     except Exception as e:
         await db.rollback()
-        print(f"Error creating document: {e}")
+        logger.error("Error creating document: %s", e)
         raise DocumentProcessingException(
             detail=f"Failed to create and process document: {e}"
         )
@@ -91,7 +136,7 @@ async def create_document(
 
 @router.get("/", response_model=List[DocumentOut])
 async def list_documents(
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenData = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -99,18 +144,21 @@ async def list_documents(
     """
     result = await db.execute(
         select(Document)
+        .options(raiseload("*"))  # DocumentOut has no relationships to load
         .where(Document.owner_id == current_user.id)
         .order_by(Document.created_at.desc())
     )
     documents = result.scalars().all()
-    print(f"Listed {len(documents)} documents for user {current_user.email}")
-    return documents
+    logger.debug(
+        "Listed %d documents for user %s", len(documents), current_user.email
+    )
+    return _list_response(DocumentListAdapter, documents)
 
 
 @router.get("/{document_id}", response_model=DocumentOut)
 async def get_document(
     document_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenData = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -118,14 +166,16 @@ async def get_document(
     Ensures the document belongs to the current user.
     """
     result = await db.execute(
-        select(Document).where(
-            Document.id == document_id, Document.owner_id == current_user.id
-        )
+        select(Document)
+        .options(raiseload("*"))
+        .where(Document.id == document_id, Document.owner_id == current_user.id)
     )
     document = result.scalar_one_or_none()
     if not document:
         raise DocumentNotFoundException()
-    print(f"Retrieved document ID {document_id} for user {current_user.email}")
+    logger.debug(
+        "Retrieved document ID %s for user %s", document_id, current_user.email
+    )
     return document
 
 
@@ -133,7 +183,7 @@ async def get_document(
 async def update_document(
     document_id: int,
     doc_update: DocumentUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenData = Depends(get_current_verified_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -142,9 +192,26 @@ async def update_document(
     - Re-processes chunks and embeddings if content changes.
     - Ensures the document belongs to the current user.
     """
+    if doc_update.content is None and doc_update.title is not None:
+        # Title-only edit: one UPDATE ... RETURNING, without loading any chunks
+        result = await db.execute(
+            update(Document)
+            .where(Document.id == document_id, Document.owner_id == current_user.id)
+            .values(title=doc_update.title)
+            .returning(Document)
+        )
+        db_document = result.scalar_one_or_none()
+        if not db_document:
+            raise DocumentNotFoundException()
+        await db.commit()
+        logger.debug(
+            "Document ID %s title updated for user %s", document_id, current_user.email
+        )
+        return db_document
+
     result = await db.execute(
         select(Document)
-        .options(selectinload(Document.chunks))
+        .options(selectinload(Document.chunks), raiseload("*"))
         .where(Document.id == document_id, Document.owner_id == current_user.id)
     )
     db_document = result.scalar_one_or_none()
@@ -163,53 +230,45 @@ async def update_document(
 
     if update_content:
         try:
-            # Delete old chunks and embeddings
-            # Iterate over a copy to avoid issues if collection changes during iteration
-            chunks_to_delete = list(db_document.chunks)
-            for chunk in chunks_to_delete:
-                if chunk.embedding_id:
-                    await mock_vector_store.delete_embedding(chunk.embedding_id)
-                await db.delete(chunk)
-            await db.flush()  # Ensure deletions are processed before adding new ones
+            # Delete old chunks and embeddings in bulk
+            embedding_ids = [
+                chunk.embedding_id for chunk in db_document.chunks if chunk.embedding_id
+            ]
+            _delete_embeddings(embedding_ids)
+            await db.execute(
+                delete(DocumentChunk).where(DocumentChunk.document_id == db_document.id)
+            )
 
             # Re-process document for AI context
             extracted_text = await document_processor.extract_text(db_document.content)
             chunks = await document_processor.chunk_text(extracted_text)
 
             # Store new chunks and vector embeddings
-            for i, chunk_text in enumerate(chunks):
-                embedding_vector = await mock_vector_store.generate_mock_embedding(
-                    chunk_text
-                )
-                embedding_id = await mock_vector_store.add_embedding(embedding_vector)
-
-                db_chunk = DocumentChunk(
-                    document_id=db_document.id,
-                    chunk_text=chunk_text,
-                    chunk_order=i,
-                    embedding_id=embedding_id,
-                )
-                db.add(db_chunk)
+            embedding_ids = _embed_chunks(chunks)
+            await _insert_chunks(db, db_document.id, chunks, embedding_ids)
 
             db_document.processed_at = datetime.now()
-            print(f"Document ID {document_id} content updated and re-processed.")
+            logger.debug(
+                "Document ID %s content updated and re-processed.", document_id
+            )
         except Exception as e:
             await db.rollback()  # Rollback changes if processing fails
-            print(f"Error re-processing document {document_id}: {e}")
+            logger.error("Error re-processing document %s: %s", document_id, e)
             raise DocumentProcessingException(
                 detail=f"Failed to re-process document content: {e}"
             )
 
     await db.commit()
-    await db.refresh(db_document)
-    print(f"Document ID {document_id} updated for user {current_user.email}")
+    logger.debug(
+        "Document ID %s updated for user %s", document_id, current_user.email
+    )
     return db_document
 
 
 @router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
     document_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenData = Depends(get_current_verified_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -218,9 +277,9 @@ async def delete_document(
     - Ensures the document belongs to the current user.
     """
     result = await db.execute(
-        select(Document)
-        .options(selectinload(Document.chunks))
-        .where(Document.id == document_id, Document.owner_id == current_user.id)
+        select(Document).where(
+            Document.id == document_id, Document.owner_id == current_user.id
+        )
     )
     db_document = result.scalar_one_or_none()
     if not db_document:
@@ -228,51 +287,59 @@ async def delete_document(
 
     try:
         # Delete from mock document system
-        await mock_document_system.delete_document(db_document.mock_system_id)
+        mock_document_system.delete_document(db_document.mock_system_id)
 
-        # Chunks are set to cascade delete with the document, but explicitly deleting embeddings
-        for chunk in db_document.chunks:
-            if chunk.embedding_id:
-                await mock_vector_store.delete_embedding(chunk.embedding_id)
+        # Only the embedding IDs are needed, so skip hydrating chunk objects
+        embedding_result = await db.execute(
+            select(DocumentChunk.embedding_id).where(
+                DocumentChunk.document_id == document_id,
+                DocumentChunk.embedding_id.is_not(None),
+            )
+        )
+        _delete_embeddings(embedding_result.scalars().all())
 
-        # Delete document from PostgreSQL (chunks will cascade delete)
+        # Delete document from PostgreSQL (chunks cascade via ON DELETE CASCADE)
         await db.delete(db_document)
         await db.commit()
-        print(
-            f"Document ID {document_id} and its chunks/embeddings deleted for user {current_user.email}"
+        logger.debug(
+            "Document ID %s and its chunks/embeddings deleted for user %s",
+            document_id,
+            current_user.email,
         )
     except Exception as e:
         await db.rollback()
-        print(f"Error deleting document {document_id}: {e}")
+        logger.error("Error deleting document %s: %s", document_id, e)
         raise DatabaseOperationException(detail=f"Failed to delete document: {e}")
 
 
 @router.get("/{document_id}/chunks", response_model=List[DocumentChunkOut])
 async def get_document_chunks(
     document_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: TokenData = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Retrieves all chunks for a specific document.
     Ensures the document belongs to the current user.
     """
-    # First, verify document ownership
-    doc_result = await db.execute(
-        select(Document).where(
-            Document.id == document_id, Document.owner_id == current_user.id
-        )
-    )
-    document = doc_result.scalar_one_or_none()
-    if not document:
-        raise DocumentNotFoundException()
-
-    # Then, retrieve chunks
+    # Fetch chunks and check ownership in a single JOIN
     chunk_result = await db.execute(
         select(DocumentChunk)
-        .where(DocumentChunk.document_id == document_id)
+        .join(Document)
+        .where(Document.id == document_id, Document.owner_id == current_user.id)
         .order_by(DocumentChunk.chunk_order)
     )
     chunks = chunk_result.scalars().all()
-    print(f"Retrieved {len(chunks)} chunks for document ID {document_id}")
-    return chunks
+    if not chunks:
+        # No rows means either an unknown document or one without chunks
+        document_exists = await db.scalar(
+            select(
+                exists().where(
+                    Document.id == document_id, Document.owner_id == current_user.id
+                )
+            )
+        )
+        if not document_exists:
+            raise DocumentNotFoundException()
+    logger.debug("Retrieved %d chunks for document ID %s", len(chunks), document_id)
+    return _list_response(DocumentChunkListAdapter, chunks)
@@ -1,7 +1,7 @@
 import logging
 
 from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -72,7 +72,7 @@ async def http_exception_handler(request: Request, exc: DocumentConnectorExcepti
         f"DocumentConnectorException caught: {exc.detail} (Status: {exc.status_code}) "
         f"for URL: {request.url}"
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
         headers=exc.headers,
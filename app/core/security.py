@@ -1,9 +1,18 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union
+from functools import lru_cache
+from typing import Any, Optional, Tuple, Union
 
+from cachetools import TLRUCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+import jwt
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -14,25 +23,96 @@ from app.db.database import get_db
 from app.db.models import User
 from app.schemas.token import TokenData
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context.
+# New hashes use Argon2id; existing bcrypt hashes still verify and are
+# marked deprecated so they get rehashed on the next successful login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=65536,  # 64 MiB
+    argon2__time_cost=3,
+    argon2__parallelism=2,
+)
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifies a plain password against a hashed password.
+    Runs in a worker thread so the CPU-bound hash doesn't block the event loop.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Checks whether a stored hash uses a deprecated scheme or outdated parameters.
+    """
+    return pwd_context.needs_update(hashed_password)
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    """
+    Returns a hash of a random password, created with the current default scheme.
+    """
+    return pwd_context.hash(secrets.token_urlsafe(16))
+
+
+async def verify_dummy_password(plain_password: str) -> None:
+    """
+    Runs a password verification that always fails.
+    Used when a login names an unknown user, so that the response time
+    doesn't reveal whether the account exists.
+    """
+    dummy_hash = await asyncio.to_thread(_dummy_password_hash)
+    await verify_password(plain_password, dummy_hash)
+
+
+async def warm_up_password_hashing() -> None:
+    """
+    Loads the hashing backends and builds the cached dummy hash ahead of time,
+    so the first login after startup doesn't pay that one-off cost.
+    """
+    dummy_hash = await asyncio.to_thread(_dummy_password_hash)
+    # Resolving the bcrypt handler loads its backend for legacy hashes too
+    await asyncio.to_thread(pwd_context.handler("bcrypt").get_backend)
+    await verify_password(secrets.token_urlsafe(16), dummy_hash)
+
+
+async def get_password_hash(password: str) -> str:
     """
     Hashes a plain password.
+    Runs in a worker thread so the CPU-bound hash doesn't block the event loop.
     """
-    return pwd_context.hash(password)
+    return await asyncio.to_thread(pwd_context.hash, password)
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# The JWT header and signing key never change, so encode them once at import
+_HS256_HEADER_SEGMENT = _b64url_encode(
+    json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode()
+)
+_SECRET_KEY_BYTES = settings.SECRET_KEY.encode()
+
+
+def _encode_hs256(payload: dict[str, Any]) -> str:
+    """
+    Encodes and signs an HS256 JWT directly with hmac, skipping the generic
+    library path (header building, algorithm lookup, key preparation) per token.
+    """
+    payload_segment = _b64url_encode(
+        json.dumps(payload, separators=(",", ":")).encode()
+    )
+    signing_input = _HS256_HEADER_SEGMENT + b"." + payload_segment
+    signature = hmac.new(_SECRET_KEY_BYTES, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url_encode(signature)).decode()
 
 
 def create_access_token(
@@ -48,32 +128,75 @@ def create_access_token(
         expire = datetime.now(timezone.utc) + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": int(expire.timestamp())})
+    if settings.ALGORITHM == "HS256":
+        return _encode_hs256(to_encode)
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
     return encoded_jwt
 
 
+@lru_cache(maxsize=4096)
+def _decode_verified_token(token: str) -> dict[str, Any]:
+    """
+    Verifies a JWT's signature and claims, caching the payload per token string
+    so repeated requests with the same token skip the HMAC check.
+    """
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
 def decode_access_token(token: str) -> dict[str, Any]:
     """
     Decodes and validates a JWT access token.
     Raises InvalidCredentialsException if the token is invalid or expired.
     """
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        return payload
-    except JWTError:
+        payload = _decode_verified_token(token)
+    except jwt.PyJWTError:
+        raise InvalidCredentialsException(detail="Could not validate credentials")
+    # Cached entries never expire, so the expiry has to be re-checked on every call
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
         raise InvalidCredentialsException(detail="Could not validate credentials")
+    return dict(payload)
+
+
+async def _load_token_user(db: AsyncSession, user_id: int) -> Optional[TokenData]:
+    """
+    Loads only the columns needed to authorize a request for the given user ID.
+    """
+    result = await db.execute(
+        select(User.id, User.email, User.is_active).where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return TokenData(id=row.id, email=row.email, is_active=row.is_active)
+
+
+def _token_user_expiry(
+    token: str, entry: Tuple[TokenData, float], now: float
+) -> float:
+    # Never keep an entry past the token's own expiry
+    return min(entry[1], now + settings.AUTH_USER_CACHE_TTL)
+
+
+# Users loaded from the database for a token, keyed by the raw (signed) token.
+# Entries hold (user, token exp) and expire with whichever comes first.
+_token_user_cache: TLRUCache = TLRUCache(
+    maxsize=10_000, ttu=_token_user_expiry, timer=time.time
+)
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
-) -> User:
+) -> TokenData:
     """
     Dependency to get the current authenticated user from the JWT token.
+    The user is built from the token claims without a database query, unless
+    AUTH_VERIFY_DB is set or the token predates the is_active claim. Users
+    loaded from the database are cached per token for AUTH_USER_CACHE_TTL.
     """
     credentials_exception = InvalidCredentialsException()
     try:
@@ -81,20 +204,27 @@ async def get_current_user(
         user_id: int = payload.get("id")
         if user_id is None:
             raise credentials_exception
-        token_data = TokenData(id=user_id)
-    except JWTError:
+    except jwt.PyJWTError:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == token_data.id))
-    user = result.scalar_one_or_none()
-    if user is None:
-        raise credentials_exception
-    return user
+    if settings.AUTH_VERIFY_DB or "is_active" not in payload:
+        cached = _token_user_cache.get(token)
+        if cached is not None:
+            return cached[0]
+        user = await _load_token_user(db, user_id)
+        if user is None:
+            raise credentials_exception
+        if settings.AUTH_USER_CACHE_TTL > 0:
+            _token_user_cache[token] = (user, payload.get("exp", float("inf")))
+        return user
+    return TokenData(
+        id=user_id, email=payload.get("sub"), is_active=payload["is_active"]
+    )
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: TokenData = Depends(get_current_user),
+) -> TokenData:
     """
     Dependency to get the current active authenticated user.
     Checks if the user is active.
@@ -104,3 +234,26 @@ async def get_current_active_user(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
     return current_user
+
+
+async def get_current_verified_user(
+    current_user: TokenData = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> TokenData:
+    """
+    Dependency for endpoints that modify data.
+    Re-checks the user against the database, so a deactivated or deleted
+    account can't write with a token issued before the change.
+    """
+    user = await _load_token_user(db, current_user.id)
+    # End the read's transaction now, so the pooled connection goes back to
+    # the pool instead of staying checked out through the endpoint's
+    # external IO; the endpoint's own writes check one out again
+    await db.commit()
+    if user is None:
+        raise InvalidCredentialsException()
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
+    return user
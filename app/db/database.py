@@ -1,22 +1,24 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 
 from app.core.config import settings
 from app.core.exceptions import DatabaseOperationException
 
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=True,  # Set to False in production for less verbose logging
-    pool_size=10,
-    max_overflow=20,
+    echo=settings.SQL_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,  # Replace connections the server has dropped
 )
 
-# Create an asynchronous session local
-AsyncSessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
+# Create an asynchronous session factory
+AsyncSessionLocal = async_sessionmaker(
     bind=engine,
-    class_=AsyncSession,
+    autoflush=False,
     expire_on_commit=False,  # Important for keeping objects in session after commit
 )
 
@@ -26,13 +28,12 @@ Base = declarative_base()
 async def get_db():
     """
     Dependency that provides an asynchronous database session.
-    It ensures the session is closed after the request is processed.
+    The session only checks out a pooled connection on its first query and
+    returns it on commit/rollback, and it is closed after the request is processed.
     """
-    db = AsyncSessionLocal()
-    try:
-        yield db
-    except Exception as e:
-        await db.rollback()  # Rollback on any exception
-        raise DatabaseOperationException(detail=f"Database error: {e}")
-    finally:
-        await db.close()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise DatabaseOperationException(detail=f"Database error: {e}")
@@ -0,0 +1,29 @@
+"""Cascade chunk deletes
+
+Revision ID: 3b8e1c9a7d42
+Revises: fac920e1d4ec
+Create Date: 2026-10-14 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e1c9a7d42'
+down_revision: Union[str, Sequence[str], None] = 'fac920e1d4ec'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('document_chunks_document_id_fkey', 'document_chunks', type_='foreignkey')
+    op.create_foreign_key('document_chunks_document_id_fkey', 'document_chunks', 'documents', ['document_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('document_chunks_document_id_fkey', 'document_chunks', type_='foreignkey')
+    op.create_foreign_key('document_chunks_document_id_fkey', 'document_chunks', 'documents', ['document_id'], ['id'])
@@ -0,0 +1,27 @@
+"""Add documents owner/created_at index
+
+Revision ID: 9d4f2a6b1e85
+Revises: 3b8e1c9a7d42
+Create Date: 2026-10-14 11:03:27.902614
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f2a6b1e85'
+down_revision: Union[str, Sequence[str], None] = '3b8e1c9a7d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_documents_owner_created', 'documents', ['owner_id', sa.text('created_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_documents_owner_created', table_name='documents')
@@ -1,5 +1,5 @@
-from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Integer, String,
-                        Text, UniqueConstraint)
+from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Index, Integer,
+                        String, Text, UniqueConstraint)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -24,6 +24,10 @@ class User(Base):
 
     documents = relationship("Document", back_populates="owner")
 
+    # Fetch server-generated timestamps via RETURNING on INSERT/UPDATE,
+    # so they are loaded without a follow-up SELECT or refresh()
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}')>"
 
@@ -53,8 +57,21 @@ class Document(Base):
     )
 
     owner = relationship("User", back_populates="documents")
+
+    __table_args__ = (
+        # Serves list_documents' "WHERE owner_id = ? ORDER BY created_at DESC"
+        # without a separate sort step
+        Index("ix_documents_owner_created", owner_id, created_at.desc()),
+    )
+    # Fetch created_at/updated_at via RETURNING on INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
+    # passive_deletes lets the database's ON DELETE CASCADE remove chunks,
+    # so deleting a document doesn't load its chunks just to delete them.
     chunks = relationship(
-        "DocumentChunk", back_populates="document", cascade="all, delete-orphan"
+        "DocumentChunk",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self):
@@ -71,7 +88,9 @@ class DocumentChunk(Base):
     __tablename__ = "document_chunks"
 
     id = Column(Integer, primary_key=True, index=True)
-    document_id = Column(Integer, ForeignKey("documents.id"), nullable=False)
+    document_id = Column(
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+    )
     chunk_text = Column(Text, nullable=False)
     chunk_order = Column(
         Integer, nullable=False
@@ -83,6 +102,7 @@ class DocumentChunk(Base):
     document = relationship("Document", back_populates="chunks")
 
     __table_args__ = (
+        # Also backs the ordered chunk lookup by document
         UniqueConstraint("document_id", "chunk_order", name="_document_chunk_order_uc"),
     )
 
@@ -4,22 +4,26 @@ from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 
-from app.api import auth, documents, users
+from app.api import auth, debug, documents, users
 from app.core.config import settings
 from app.core.exceptions import (DocumentConnectorException,
                                  http_exception_handler)
+from app.core.security import warm_up_password_hashing
 from app.db.database import engine, get_db
-from app.db.models import Base
 
 logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    logger.info("Application starting up...")
+async def check_database_connection() -> None:
+    """
+    Waits for the database to accept connections, retrying a fixed number of
+    times. Runs a single SELECT 1 rather than reflecting the whole schema.
+    """
     MAX_RETRIES = 10
     RETRY_DELAY = 3
     for i in range(MAX_RETRIES):
@@ -28,9 +32,9 @@ async def lifespan(app: FastAPI):
                 f"Attempting to connect to database (retry {i+1}/{MAX_RETRIES})..."
             )
             async with engine.connect() as conn:
-                await conn.run_sync(Base.metadata.reflect)
+                await conn.execute(text("SELECT 1"))
             logger.info("Database connection successful!")
-            break
+            return
         except OperationalError as e:
             logger.error(f"Database connection failed: {e}")
             if i < MAX_RETRIES - 1:
@@ -47,6 +51,19 @@ async def lifespan(app: FastAPI):
             )
             raise
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Application starting up...")
+    if settings.DB_HEALTHCHECK_ON_START:
+        await check_database_connection()
+    else:
+        # pool_pre_ping still validates every connection on checkout
+        logger.info("Skipping startup database health check.")
+
+    await warm_up_password_hashing()
+    logger.info("Password hashing backends warmed up.")
+
     yield
 
     logger.info("Application shutting down...")
@@ -54,11 +71,20 @@ async def lifespan(app: FastAPI):
     logger.info("Database connection pool disposed.")
 
 
+def include_debug_router(application: FastAPI) -> None:
+    """
+    Mounts the debug endpoints when ENABLE_DEBUG_ENDPOINTS is set.
+    """
+    if settings.ENABLE_DEBUG_ENDPOINTS:
+        application.include_router(debug.router)
+
+
 app = FastAPI(
     title="Document Connector API",
     description="API for document management, processing, and AI context.",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -72,5 +98,6 @@ app.add_middleware(
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(documents.router)
+include_debug_router(app)
 
 app.add_exception_handler(DocumentConnectorException, http_exception_handler)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class DocumentBase(BaseModel):
@@ -44,8 +44,8 @@ class DocumentOut(DocumentBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True  # Allows Pydantic to read data from ORM models
+    # from_attributes allows Pydantic to read data from ORM models
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class DocumentChunkOut(BaseModel):
@@ -59,5 +59,9 @@ class DocumentChunkOut(BaseModel):
         None, example="vec_embed_abcde"
     )  # ID from the mock vector store
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+# Module-level adapters so list responses reuse one compiled validator/serializer
+DocumentListAdapter = TypeAdapter(List[DocumentOut])
+DocumentChunkListAdapter = TypeAdapter(List[DocumentChunkOut])
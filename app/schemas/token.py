@@ -15,3 +15,4 @@ class TokenData(BaseModel):
 
     email: Optional[str] = None
     id: Optional[int] = None  # User ID
+    is_active: Optional[bool] = None
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class UserBase(BaseModel):
@@ -27,5 +27,5 @@ class UserOut(UserBase):
     id: int
     is_active: bool = True
 
-    class Config:
-        from_attributes = True  # Allows Pydantic to read data from ORM models
+    # from_attributes allows Pydantic to read data from ORM models
+    model_config = ConfigDict(from_attributes=True, frozen=True)
@@ -1,4 +1,7 @@
-from typing import List, Tuple
+import logging
+from typing import List, Tuple, Union
+
+logger = logging.getLogger(__name__)
 
 
 class DocumentProcessor:
@@ -6,15 +9,18 @@ class DocumentProcessor:
     Handles document processing for AI context, including text extraction and chunking.
     """
 
-    async def extract_text(self, document_content: str) -> str:
+    async def extract_text(self, document_content: Union[str, bytes]) -> str:
         """
         Simulates text extraction from a document.
-        For this mock, it simply returns the provided content.
+        For this mock, it simply returns the provided content; raw bytes
+        (e.g. an uploaded file body) are decoded from UTF-8 once, here.
         In a real application, this would involve parsing PDFs, DOCX, etc.
         """
         # Simulate some processing time
         # await asyncio.sleep(0.1)
-        print("DocumentProcessor: Text extraction simulated.")
+        if isinstance(document_content, bytes):
+            document_content = document_content.decode("utf-8")
+        logger.debug("Text extraction simulated.")
         return document_content
 
     async def chunk_text(
@@ -26,21 +32,19 @@ class DocumentProcessor:
         In a real application, more sophisticated methods (e.g., NLTK, spaCy, LangChain text splitters)
         would be used to respect sentence/paragraph boundaries.
         """
+        step = chunk_size - overlap
+        if step <= 0:
+            raise ValueError("chunk_size must be greater than overlap")
         if not text:
             return []
 
-        chunks = []
-        start = 0
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            chunks.append(chunk)
-            start += chunk_size - overlap
-            if (
-                start < 0
-            ):  # Handle cases where overlap is larger than chunk size (shouldn't happen with positive values)
-                start = 0
-        print(f"DocumentProcessor: Text chunked into {len(chunks)} parts.")
+        # Chunk start offsets come from a C-level range, and each chunk is
+        # sliced exactly once, instead of a Python while-loop with manual
+        # offset bookkeeping.
+        chunks = [
+            text[start : start + chunk_size] for start in range(0, len(text), step)
+        ]
+        logger.debug("Text chunked into %d parts.", len(chunks))
         return chunks
 
 
@@ -1,6 +1,10 @@
-import uuid
+import logging
 from typing import Any, Dict, Optional
 
+from app.services.mock_ids import next_mock_id
+
+logger = logging.getLogger(__name__)
+
 
 class MockDocumentSystem:
     """
@@ -10,42 +14,40 @@ class MockDocumentSystem:
 
     _documents: Dict[str, Dict[str, Any]] = {}  # {mock_system_id: {title, content}}
 
-    async def upload_document(self, title: str, content: str) -> Dict[str, Any]:
+    def upload_document(self, title: str, content: str) -> Dict[str, Any]:
         """
         Simulates uploading a document to the external system.
         Generates a unique mock_system_id.
         """
-        mock_system_id = str(uuid.uuid4())
+        mock_system_id = next_mock_id("mock_doc")
         self._documents[mock_system_id] = {
             "title": title,
             "content": content,
             "mock_system_id": mock_system_id,
         }
-        print(f"MockDocSystem: Document '{title}' uploaded with ID '{mock_system_id}'")
+        logger.debug("Document '%s' uploaded with ID '%s'", title, mock_system_id)
         return self._documents[mock_system_id]
 
-    async def get_document_content(self, mock_system_id: str) -> Optional[str]:
+    def get_document_content(self, mock_system_id: str) -> Optional[str]:
         """
         Simulates retrieving document content from the external system.
         """
         doc = self._documents.get(mock_system_id)
         if doc:
-            print(f"MockDocSystem: Content for ID '{mock_system_id}' retrieved.")
+            logger.debug("Content for ID '%s' retrieved.", mock_system_id)
             return doc["content"]
-        print(f"MockDocSystem: Document with ID '{mock_system_id}' not found.")
+        logger.debug("Document with ID '%s' not found.", mock_system_id)
         return None
 
-    async def delete_document(self, mock_system_id: str) -> bool:
+    def delete_document(self, mock_system_id: str) -> bool:
         """
         Simulates deleting a document from the external system.
         """
         if mock_system_id in self._documents:
             del self._documents[mock_system_id]
-            print(f"MockDocSystem: Document with ID '{mock_system_id}' deleted.")
+            logger.debug("Document with ID '%s' deleted.", mock_system_id)
             return True
-        print(
-            f"MockDocSystem: Document with ID '{mock_system_id}' not found for deletion."
-        )
+        logger.debug("Document with ID '%s' not found for deletion.", mock_system_id)
         return False
 
 
@@ -0,0 +1,15 @@
+import itertools
+import secrets
+
+# Mock IDs only need to be unique, not unpredictable. A random per-process
+# prefix keeps them unique across restarts and workers, and the counter avoids
+# a urandom read and UUID formatting per ID.
+_ID_PREFIX = secrets.token_hex(8)
+_id_counter = itertools.count(1)
+
+
+def next_mock_id(kind: str) -> str:
+    """
+    Returns a new process-unique ID of the form "<kind>_<prefix>_<n>".
+    """
+    return f"{kind}_{_ID_PREFIX}_{next(_id_counter)}"
@@ -1,63 +1,152 @@
-import random
-import uuid
+import logging
 from typing import Dict, List, Optional
 
+import numpy as np
+
+from app.services.mock_ids import next_mock_id
+
+logger = logging.getLogger(__name__)
+
+# Dimension of the mock embeddings; a common size for many models
+# (e.g., OpenAI's text-embedding-ada-002)
+EMBEDDING_SIZE = 1536
+
+_rng = np.random.default_rng()
+
 
 class MockVectorStore:
     """
     Simulates a vector database for storing document embeddings.
-    Uses an in-memory dictionary.
+    Keeps all vectors in one contiguous in-memory float32 matrix.
     """
 
-    _embeddings: Dict[str, List[float]] = {}  # {embedding_id: [vector_floats]}
+    def __init__(self):
+        # Rows [0, len(self._row_ids)) of the matrix hold live embeddings;
+        # capacity doubles when it runs out.
+        self._matrix: np.ndarray = np.empty((0, EMBEDDING_SIZE), dtype=np.float32)
+        self._id_to_row: Dict[str, int] = {}  # {embedding_id: row index}
+        self._row_ids: List[str] = []  # [embedding_id for each used row]
+
+    def _reserve(self, count: int) -> None:
+        """
+        Ensures the matrix has room for `count` more rows.
+        """
+        used = len(self._row_ids)
+        needed = used + count
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        grown = np.empty((max(needed, capacity * 2), EMBEDDING_SIZE), dtype=np.float32)
+        grown[:used] = self._matrix[:used]
+        self._matrix = grown
+
+    def _remove(self, embedding_id: str) -> bool:
+        """
+        Removes an embedding by moving the last used row into its slot,
+        so the used rows stay contiguous.
+        """
+        row = self._id_to_row.pop(embedding_id, None)
+        if row is None:
+            return False
+        last_row = len(self._row_ids) - 1
+        last_id = self._row_ids.pop()
+        if row != last_row:
+            self._matrix[row] = self._matrix[last_row]
+            self._row_ids[row] = last_id
+            self._id_to_row[last_id] = row
+        return True
 
-    async def add_embedding(self, embedding_vector: List[float]) -> str:
+    def add_embedding(self, embedding_vector: np.ndarray) -> str:
         """
         Adds an embedding vector to the store and returns a unique ID.
         """
-        embedding_id = str(uuid.uuid4())
-        self._embeddings[embedding_id] = embedding_vector
-        print(f"MockVectorStore: Added embedding with ID '{embedding_id}'.")
+        embedding_id = next_mock_id("vec")
+        self._reserve(1)
+        row = len(self._row_ids)
+        self._matrix[row] = embedding_vector
+        self._row_ids.append(embedding_id)
+        self._id_to_row[embedding_id] = row
+        logger.debug("Added embedding with ID '%s'.", embedding_id)
         return embedding_id
 
-    async def get_embedding(self, embedding_id: str) -> Optional[List[float]]:
+    def get_embedding(self, embedding_id: str) -> Optional[np.ndarray]:
         """
         Retrieves an embedding vector by its ID.
+        Returns a view into the store's matrix (no copy); it is only valid
+        until the store is next modified.
         """
-        embedding = self._embeddings.get(embedding_id)
-        if embedding:
-            print(f"MockVectorStore: Retrieved embedding with ID '{embedding_id}'.")
-        else:
-            print(f"MockVectorStore: Embedding with ID '{embedding_id}' not found.")
-        return embedding
+        row = self._id_to_row.get(embedding_id)
+        if row is None:
+            logger.debug("Embedding with ID '%s' not found.", embedding_id)
+            return None
+        logger.debug("Retrieved embedding with ID '%s'.", embedding_id)
+        return self._matrix[row]
 
-    async def delete_embedding(self, embedding_id: str) -> bool:
+    def delete_embedding(self, embedding_id: str) -> bool:
         """
         Deletes an embedding vector by its ID.
         """
-        if embedding_id in self._embeddings:
-            del self._embeddings[embedding_id]
-            print(f"MockVectorStore: Deleted embedding with ID '{embedding_id}'.")
+        if self._remove(embedding_id):
+            logger.debug("Deleted embedding with ID '%s'.", embedding_id)
             return True
-        print(
-            f"MockVectorStore: Embedding with ID '{embedding_id}' not found for deletion."
-        )
+        logger.debug("Embedding with ID '%s' not found for deletion.", embedding_id)
         return False
 
-    async def generate_mock_embedding(self, text: str) -> List[float]:
+    def delete_embeddings(self, embedding_ids: List[str]) -> int:
+        """
+        Deletes a batch of embedding vectors by their IDs.
+        Returns the number of embeddings that were actually removed.
+        """
+        deleted = sum(self._remove(embedding_id) for embedding_id in embedding_ids)
+        logger.debug("Deleted %d embeddings in batch.", deleted)
+        return deleted
+
+    def generate_mock_embedding(self, text: str) -> np.ndarray:
         """
         Generates a mock embedding vector for a given text.
         In a real application, this would use an actual embedding model (e.g., OpenAI, Sentence Transformers).
         """
         # Create a fixed-size vector of random floats for demonstration
         # The actual values don't matter for a mock, only the structure.
-        embedding_size = (
-            1536  # Common size for many models (e.g., OpenAI's text-embedding-ada-002)
+        logger.debug("Generating mock embedding for text (length %d).", len(text))
+        # One vectorized NumPy call into a contiguous float32 buffer
+        return _rng.uniform(-1.0, 1.0, size=EMBEDDING_SIZE).astype(
+            np.float32, copy=False
         )
-        print(
-            f"MockVectorStore: Generating mock embedding for text (length {len(text)})."
+
+    def generate_mock_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generates mock embedding vectors for a batch of texts in a single call.
+        Real embedding providers accept a list of inputs per request, which avoids
+        one round-trip per chunk.
+        Returns a (len(texts), EMBEDDING_SIZE) float32 array, one row per text.
+        """
+        logger.debug("Generating %d mock embeddings in batch.", len(texts))
+        # Fill the whole batch in one C loop, drawing float32 directly to avoid
+        # a float64 temporary, then scale [0, 1) to [-1, 1) in place
+        embeddings = _rng.random((len(texts), EMBEDDING_SIZE), dtype=np.float32)
+        embeddings *= 2.0
+        embeddings -= 1.0
+        return embeddings
+
+    def add_embeddings(self, embedding_vectors: np.ndarray) -> List[str]:
+        """
+        Adds a batch of embedding vectors (one per row) to the store and returns
+        their IDs, in the same order as the input vectors.
+        """
+        count = len(embedding_vectors)
+        self._reserve(count)
+        first_row = len(self._row_ids)
+        # Copy the whole batch into the matrix with one slice assignment
+        self._matrix[first_row : first_row + count] = embedding_vectors
+        embedding_ids = [next_mock_id("vec") for _ in range(count)]
+        self._row_ids.extend(embedding_ids)
+        self._id_to_row.update(
+            (embedding_id, row)
+            for row, embedding_id in enumerate(embedding_ids, start=first_row)
         )
-        return [random.uniform(-1, 1) for _ in range(embedding_size)]
+        logger.debug("Added %d embeddings in batch.", count)
+        return embedding_ids
 
 
 # Instantiate the mock vector store
@@ -1,34 +1,129 @@
+import os
+
+import numpy as np
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.future import select
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import \
-    NullPool  # Import NullPool for better test isolation
-
+from passlib.context import CryptContext
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
+                                    create_async_engine)
+from sqlalchemy.pool import StaticPool
+
+from app.api import documents
+from app.core import security
 from app.core.config import settings
 from app.core.security import get_current_user, get_password_hash
 from app.db.database import Base, get_db
 from app.db.models import User
 from app.main import app
+from app.services.vector_store import EMBEDDING_SIZE, MockVectorStore
+
+# Use the test database URL from settings.
+# Under pytest-xdist each worker gets its own database (e.g. "testdb_gw0"),
+# so workers never share tables that setup_test_db creates and drops.
+TEST_DATABASE_URL = make_url(settings.TEST_DATABASE_URL)
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+if XDIST_WORKER:
+    TEST_DATABASE_URL = TEST_DATABASE_URL.set(
+        database=f"{TEST_DATABASE_URL.database}_{XDIST_WORKER}"
+    )
 
-# Use the test database URL from settings
-TEST_DATABASE_URL = settings.TEST_DATABASE_URL
-
-# Create a test engine with NullPool for better isolation during tests.
-# NullPool ensures connections are not reused across greenlets/tasks,
-# which can help prevent "another operation in progress" errors.
-test_engine = create_async_engine(TEST_DATABASE_URL, echo=False, poolclass=NullPool)
+# Create a test engine with a small connection pool.
+# Isolation comes from the per-test transaction rollback in db_session, so
+# connections can be reused safely instead of reconnecting for every test.
+# All tests share one event loop (see pytest.ini), which pooled asyncio
+# connections require.
+# SQLite uses StaticPool: one connection shared by every test, which keeps an
+# in-memory database alive and SQLite's prepared statements warm between tests.
+if TEST_DATABASE_URL.get_backend_name() == "sqlite":
+    pool_options = {
+        "poolclass": StaticPool,
+        "connect_args": {"check_same_thread": False},
+    }
+else:
+    pool_options = {"pool_size": 4, "max_overflow": 0}
+
+# The compiled-statement cache is on by default; it is sized above the
+# default 500 so the suite's distinct statements all stay cached.
+test_engine = create_async_engine(
+    TEST_DATABASE_URL,
+    echo=False,
+    query_cache_size=1200,
+    **pool_options,
+)
 
-TestAsyncSessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=test_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
+if test_engine.dialect.name == "sqlite":
+
+    @event.listens_for(test_engine.sync_engine, "connect")
+    def _configure_sqlite_connection(dbapi_connection, connection_record):
+        """
+        Tunes each SQLite connection for a throwaway test database.
+        Also turns off the driver's own transaction handling, so that
+        SQLAlchemy emits BEGIN itself (see _begin_sqlite_transaction) and
+        SAVEPOINTs behave as they do on Postgres.
+        """
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        # ON DELETE CASCADE on document_chunks relies on foreign keys being enforced
+        cursor.execute("PRAGMA foreign_keys=ON")
+        # Durability is irrelevant for a database that lives only in memory
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(test_engine.sync_engine, "begin")
+    def _begin_sqlite_transaction(conn):
+        conn.exec_driver_sql("BEGIN")
+
+# expire_on_commit=False keeps attributes loaded after commit; tests assert on
+# in-memory state and read fresh values through explicit select() calls.
+TestAsyncSessionLocal = async_sessionmaker(
+    bind=test_engine, autoflush=False, expire_on_commit=False
 )
 
 
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """
+    Fixture to swap the app's password hashing context for one with the
+    cheapest valid cost settings, for the entire test session.
+    The schemes match production, so scheme detection and rehash-on-login
+    still behave the same; only the per-hash cost is lowered.
+    """
+    fast_context = CryptContext(
+        schemes=["argon2", "bcrypt"],
+        deprecated="auto",
+        argon2__type="ID",
+        argon2__memory_cost=8,
+        argon2__time_cost=1,
+        argon2__parallelism=1,
+        bcrypt__rounds=4,
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(security, "pwd_context", fast_context)
+        security._dummy_password_hash.cache_clear()
+        yield fast_context
+    security._dummy_password_hash.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def fast_vector_store(monkeypatch):
+    """
+    Fixture to give each test its own empty vector store, so embeddings don't
+    pile up in the app's singleton across the session.
+    Its mock embeddings are constant zero vectors, which skips drawing
+    EMBEDDING_SIZE random floats per chunk; no test depends on their values.
+    """
+    store = MockVectorStore()
+    monkeypatch.setattr(
+        store,
+        "generate_mock_embeddings",
+        lambda texts: np.zeros((len(texts), EMBEDDING_SIZE), dtype=np.float32),
+    )
+    monkeypatch.setattr(documents, "mock_vector_store", store)
+    return store
+
+
 @pytest.fixture(scope="session", autouse=True)
 async def setup_test_db():
     """
@@ -57,7 +152,12 @@ async def db_session():
         async with connection.begin() as transaction:
             # Bind a session to the connection within the transaction.
             # All operations within this session will be part of this transaction.
-            session = TestAsyncSessionLocal(bind=connection)
+            # With create_savepoint, the session's own commit() and rollback()
+            # (including the app's) act on a SAVEPOINT, never on the outer
+            # transaction, so the final rollback always undoes the whole test.
+            session = TestAsyncSessionLocal(
+                bind=connection, join_transaction_mode="create_savepoint"
+            )
             try:
                 yield session
             finally:
@@ -69,8 +169,20 @@ async def db_session():
                 await session.close()
 
 
+@pytest.fixture(scope="session")
+async def asgi_client():
+    """
+    Fixture to provide one AsyncClient for the whole test session.
+    The ASGI transport is built once and reused by every test.
+    """
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        yield ac
+
+
 @pytest.fixture(scope="function")
-async def client(db_session: AsyncSession):
+async def client(asgi_client: AsyncClient, db_session: AsyncSession):
     """
     Fixture to provide a base AsyncClient for testing FastAPI endpoints.
     It overrides the get_db dependency to use the test session.
@@ -81,49 +193,42 @@ async def client(db_session: AsyncSession):
     # Override the get_db dependency to use the test database session
     app.dependency_overrides[get_db] = lambda: db_session
 
-    # Use AsyncClient with ASGITransport to test the FastAPI app instance
-    async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
-    ) as ac:
-        yield ac
+    yield asgi_client
 
-    # Clean up overrides after the test to ensure no lingering dependencies.
-    # This is vital for test isolation.
+    # Clean up overrides and any per-test headers after the test to ensure
+    # nothing lingers on the shared client. This is vital for test isolation.
     app.dependency_overrides = {}
+    asgi_client.headers.pop("Authorization", None)
+    asgi_client.cookies.clear()
 
 
-@pytest.fixture(scope="function")
-async def authenticated_client(client: AsyncClient, db_session: AsyncSession):
-    """
-    Fixture to provide an AsyncClient authenticated as a specific test user.
-    This user is created and logged in for each test requiring authentication.
-    It builds upon the base 'client' fixture.
-    """
-    # Create a dedicated user for authentication tests to ensure isolation.
-    # We use a unique email to avoid conflicts if multiple authenticated_client
-    # fixtures are somehow instantiated in a way that bypasses transaction isolation.
-    test_user_email = "docuser@example.com"
-    test_user_password = "docpassword"
-
-    # Ensure the user exists in the test database.
-    # This part needs to be careful not to conflict with other tests.
-    # The db_session fixture's transaction-per-test ensures this is safe.
-    user_exists = await db_session.execute(
-        select(User).where(User.email == test_user_email)
-    )
-    test_user = user_exists.scalar_one_or_none()
-
-    if not test_user:
-        test_user = User(
-            email=test_user_email,
-            hashed_password=get_password_hash(test_user_password),
+@pytest.fixture(scope="session")
+async def test_user(fast_password_hashing, setup_test_db):
+    """
+    Fixture to create the user that authenticated tests run as, once per session.
+    The user is committed outside the per-test transactions, so every test's
+    rollback leaves it in place and its password is only hashed once.
+    The tables are dropped with everything else when the session ends.
+    """
+    async with TestAsyncSessionLocal() as session:
+        user = User(
+            email="docuser@example.com",
+            hashed_password=await get_password_hash("docpassword"),
             is_active=True,
         )
-        db_session.add(test_user)
-        await db_session.commit()  # Commit the user creation within its own transaction
-        await db_session.refresh(test_user)
+        session.add(user)
+        await session.commit()
+    return user
+
+
+@pytest.fixture(scope="function")
+async def authenticated_client(client: AsyncClient, test_user: User):
+    """
+    Fixture to provide an AsyncClient authenticated as the session's test user.
+    It builds upon the base 'client' fixture and overrides get_current_user,
+    so no login request is needed per test.
+    """
 
-    # Now, override get_current_user for this specific authenticated client's scope
     async def override_get_current_user():
         return test_user
 
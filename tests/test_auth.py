@@ -1,8 +1,17 @@
+import time
+from datetime import timedelta
+
+import jwt
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core.config import settings
+from app.core.exceptions import InvalidCredentialsException
+from app.core import security
+from app.core.security import (create_access_token, decode_access_token,
+                               get_current_user)
 from app.db.models import User
 
 
@@ -65,6 +74,29 @@ async def test_login_for_access_token(client: AsyncClient):
     assert data["token_type"] == "bearer"
 
 
+@pytest.mark.asyncio
+async def test_login_rehashes_legacy_bcrypt_hash(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """Test that a bcrypt hash is upgraded to Argon2 on successful login."""
+    legacy_user = User(
+        email="legacy@example.com",
+        hashed_password=security.pwd_context.handler("bcrypt").hash("legacypassword"),
+        is_active=True,
+    )
+    db_session.add(legacy_user)
+    await db_session.commit()
+
+    response = await client.post(
+        "/auth/token",
+        data={"username": "legacy@example.com", "password": "legacypassword"},
+    )
+    assert response.status_code == 200
+
+    await db_session.refresh(legacy_user)
+    assert security.pwd_context.identify(legacy_user.hashed_password) == "argon2"
+
+
 @pytest.mark.asyncio
 async def test_login_invalid_credentials(client: AsyncClient):
     """Test login with incorrect password."""
@@ -111,6 +143,28 @@ async def test_read_users_me_authenticated(
     assert "id" in data
 
 
+@pytest.mark.asyncio
+async def test_read_users_me_with_token(client: AsyncClient):
+    """Test /users/me resolves the user from a real access token."""
+    await client.post(
+        "/auth/register",
+        json={"email": "tokenuser@example.com", "password": "tokenpassword"},
+    )
+    login_response = await client.post(
+        "/auth/token",
+        data={"username": "tokenuser@example.com", "password": "tokenpassword"},
+    )
+    token = login_response.json()["access_token"]
+
+    response = await client.get(
+        "/users/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["email"] == "tokenuser@example.com"
+    assert data["is_active"] is True
+
+
 @pytest.mark.asyncio
 async def test_read_users_me_unauthenticated(client: AsyncClient):
     """Test /users/me endpoint without authentication."""
@@ -119,3 +173,45 @@ async def test_read_users_me_unauthenticated(client: AsyncClient):
     response = await client.get("/users/me")
     assert response.status_code == 401
     assert response.json()["detail"] == "Not authenticated"
+
+
+def test_create_access_token_matches_pyjwt():
+    """Test that the HS256 fast path produces a standard, verifiable JWT."""
+    token = create_access_token(data={"sub": "fast@example.com", "id": 7})
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    assert payload["sub"] == "fast@example.com"
+    assert payload["id"] == 7
+    assert jwt.get_unverified_header(token) == {"alg": "HS256", "typ": "JWT"}
+
+
+def test_decode_access_token_rechecks_expiry_of_cached_token(monkeypatch):
+    """Test that a cached token is still rejected once it has expired."""
+    token = create_access_token(
+        data={"sub": "cache@example.com", "id": 1}, expires_delta=timedelta(minutes=1)
+    )
+    assert decode_access_token(token)["id"] == 1
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    with pytest.raises(InvalidCredentialsException):
+        decode_access_token(token)
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_caches_database_lookup(
+    db_session: AsyncSession, monkeypatch
+):
+    """Test that a user verified against the database is reused for the same token."""
+    monkeypatch.setattr(settings, "AUTH_VERIFY_DB", True)
+    user = User(email="cached@example.com", hashed_password="unused", is_active=True)
+    db_session.add(user)
+    await db_session.commit()
+    token = create_access_token(
+        data={"sub": user.email, "id": user.id, "is_active": True}
+    )
+
+    first = await get_current_user(token=token, db=db_session)
+    # A cache hit must not touch the database at all
+    second = await get_current_user(token=token, db=None)
+    assert second == first
+    assert second.email == "cached@example.com"
@@ -0,0 +1,33 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.main import include_debug_router
+
+
+@pytest.mark.asyncio
+async def test_pool_status_endpoint(monkeypatch):
+    """Test /debug/pool reports the pool counters when debug endpoints are on."""
+    monkeypatch.setattr(settings, "ENABLE_DEBUG_ENDPOINTS", True)
+    debug_app = FastAPI()
+    include_debug_router(debug_app)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=debug_app), base_url="http://test"
+    ) as ac:
+        response = await ac.get("/debug/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"status", "size", "checked_in", "checked_out", "overflow"}
+    assert isinstance(data["status"], str)
+    assert isinstance(data["size"], int)
+
+
+def test_pool_status_endpoint_not_mounted_when_disabled(monkeypatch):
+    """Test /debug/pool is absent when debug endpoints are off."""
+    monkeypatch.setattr(settings, "ENABLE_DEBUG_ENDPOINTS", False)
+    debug_app = FastAPI()
+    include_debug_router(debug_app)
+
+    assert "/debug/pool" not in {route.path for route in debug_app.routes}
@@ -0,0 +1,32 @@
+import pytest
+
+from app.services.document_processor import document_processor
+
+
+@pytest.mark.asyncio
+async def test_chunk_text_overlapping_windows():
+    """Test that chunks are fixed-size windows advancing by chunk_size - overlap."""
+    chunks = await document_processor.chunk_text("abcdefghij", chunk_size=4, overlap=1)
+    assert chunks == ["abcd", "defg", "ghij", "j"]
+
+
+@pytest.mark.asyncio
+async def test_chunk_text_short_and_empty_text():
+    """Test chunking text shorter than one chunk, and empty text."""
+    assert await document_processor.chunk_text("short") == ["short"]
+    assert await document_processor.chunk_text("") == []
+
+
+@pytest.mark.asyncio
+async def test_chunk_text_rejects_overlap_not_smaller_than_chunk_size():
+    """Test that an overlap that would never advance the window is rejected."""
+    with pytest.raises(ValueError):
+        await document_processor.chunk_text("abc", chunk_size=2, overlap=2)
+
+
+@pytest.mark.asyncio
+async def test_extract_text_decodes_bytes_once():
+    """Test that raw UTF-8 bytes are decoded to the same text as a str input."""
+    content = "r\u00e9sum\u00e9 \u2014 na\u00efve"
+    assert await document_processor.extract_text(content.encode("utf-8")) == content
+    assert await document_processor.extract_text(content) == content
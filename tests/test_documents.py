@@ -1,9 +1,34 @@
+import orjson
 import pytest
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, func, insert
+from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
+                                    create_async_engine)
 from sqlalchemy.future import select
 
+from app.api import documents
+from app.core.security import get_current_user
+from app.db.database import Base, get_db
 from app.db.models import Document, DocumentChunk, User
+from app.main import app
+from app.schemas.token import TokenData
+
+
+# Statements for repeated lookups, built once with bound parameters and
+# executed with the values, e.g. execute(DOCUMENT_BY_ID, {"id": doc_id})
+DOCUMENT_BY_ID = select(Document).where(Document.id == bindparam("id"))
+DOCUMENT_ID_BY_ID = select(Document.id).where(Document.id == bindparam("id"))
+DOCUMENT_BY_TITLE = select(Document).where(Document.title == bindparam("title"))
+CHUNK_COUNT_BY_DOCUMENT = (
+    select(func.count())
+    .select_from(DocumentChunk)
+    .where(DocumentChunk.document_id == bindparam("document_id"))
+)
+
+# Payloads posted as-is, serialized once at import instead of per request
+JSON_HEADERS = {"content-type": "application/json"}
+DOC_1_PAYLOAD = orjson.dumps({"title": "Doc 1", "content": "Content 1"})
+DOC_2_PAYLOAD = orjson.dumps({"title": "Doc 2", "content": "Content 2"})
 
 
 @pytest.mark.asyncio
@@ -25,9 +50,7 @@ async def test_create_document(
     assert "updated_at" in data
 
     # Verify document is in DB
-    result = await db_session.execute(
-        select(Document).where(Document.title == "My Test Document")
-    )
+    result = await db_session.execute(DOCUMENT_BY_TITLE, {"title": "My Test Document"})
     doc_in_db = result.scalar_one_or_none()
     assert doc_in_db is not None
     assert doc_in_db.title == "My Test Document"
@@ -40,10 +63,10 @@ async def test_list_documents(
     """Test listing documents for the authenticated user."""
     # Create a few documents for the authenticated user
     await authenticated_client.post(
-        "/documents/", json={"title": "Doc 1", "content": "Content 1"}
+        "/documents/", content=DOC_1_PAYLOAD, headers=JSON_HEADERS
     )
     await authenticated_client.post(
-        "/documents/", json={"title": "Doc 2", "content": "Content 2"}
+        "/documents/", content=DOC_2_PAYLOAD, headers=JSON_HEADERS
     )
 
     response = await authenticated_client.get("/documents/")
@@ -96,7 +119,6 @@ async def test_get_document_unauthorized(client: AsyncClient, db_session: AsyncS
     )
     db_session.add(test_user)
     await db_session.commit()
-    await db_session.refresh(test_user)
 
     doc = Document(
         title="Unauthorized Doc",
@@ -106,7 +128,6 @@ async def test_get_document_unauthorized(client: AsyncClient, db_session: AsyncS
     )
     db_session.add(doc)
     await db_session.commit()
-    await db_session.refresh(doc)
 
     # Use the base client (unauthenticated) to try and access the document
     response = await client.get(f"/documents/{doc.id}")
@@ -134,11 +155,33 @@ async def test_update_document_title(
     assert data["content"] == "Some content"
 
     # Verify in DB
-    result = await db_session.execute(select(Document).where(Document.id == doc_id))
+    result = await db_session.execute(DOCUMENT_BY_ID, {"id": doc_id})
     doc_in_db = result.scalar_one_or_none()
     assert doc_in_db.title == "New Title"
 
 
+@pytest.mark.asyncio
+async def test_update_document_title_only(
+    authenticated_client: AsyncClient, db_session: AsyncSession
+):
+    """Test updating only a document's title keeps its content and chunks."""
+    create_response = await authenticated_client.post(
+        "/documents/", json={"title": "Title Only", "content": "Unchanged content"}
+    )
+    doc_id = create_response.json()["id"]
+
+    update_response = await authenticated_client.put(
+        f"/documents/{doc_id}", json={"title": "Renamed"}
+    )
+    assert update_response.status_code == 200
+    data = update_response.json()
+    assert data["title"] == "Renamed"
+    assert data["content"] == "Unchanged content"
+
+    chunks_response = await authenticated_client.get(f"/documents/{doc_id}/chunks")
+    assert chunks_response.json()[0]["chunk_text"] == "Unchanged content"
+
+
 @pytest.mark.asyncio
 async def test_update_document_content_reprocesses(
     authenticated_client: AsyncClient, db_session: AsyncSession
@@ -177,6 +220,12 @@ async def test_update_document_content_reprocesses(
     assert len(updated_chunks_response.json()) > 0
     assert updated_chunks_response.json()[0]["chunk_text"] == updated_content
 
+    # The old chunks were replaced, not added to; count rather than load them
+    assert (
+        await db_session.scalar(CHUNK_COUNT_BY_DOCUMENT, {"document_id": doc_id})
+        == len(updated_chunks_response.json())
+    )
+
 
 @pytest.mark.asyncio
 async def test_delete_document(
@@ -191,10 +240,13 @@ async def test_delete_document(
     response = await authenticated_client.delete(f"/documents/{doc_id}")
     assert response.status_code == 204
 
-    # Verify document is deleted from DB
-    result = await db_session.execute(select(Document).where(Document.id == doc_id))
-    doc_in_db = result.scalar_one_or_none()
-    assert doc_in_db is None
+    # Verify document is deleted from DB, selecting only its ID rather than
+    # loading an ORM object just to check that there is none
+    assert await db_session.scalar(DOCUMENT_ID_BY_ID, {"id": doc_id}) is None
+    # Its chunks go with it through ON DELETE CASCADE
+    assert (
+        await db_session.scalar(CHUNK_COUNT_BY_DOCUMENT, {"document_id": doc_id}) == 0
+    )
 
 
 @pytest.mark.asyncio
@@ -207,17 +259,11 @@ async def test_delete_non_existent_document(authenticated_client: AsyncClient):
 
 @pytest.mark.asyncio
 async def test_get_document_chunks(
-    authenticated_client: AsyncClient, db_session: AsyncSession
+    authenticated_client: AsyncClient, db_session: AsyncSession, test_user: User
 ):
     """Test retrieving chunks for a specific document."""
-    # The authenticated_client fixture already ensures a user is created.
-    # We'll use this user's ID for the document.
-    user_result = await db_session.execute(
-        select(User).where(User.email == "docuser@example.com")
-    )
-    test_user = user_result.scalar_one_or_none()
-    assert test_user is not None  # Ensure the mock user exists
-
+    # authenticated_client acts as the session's test_user, so the document
+    # is owned by that user's ID.
     doc_with_chunks = Document(
         title="Chunked Doc",
         content="Chunk 1. Chunk 2. Chunk 3.",
@@ -229,17 +275,20 @@ async def test_get_document_chunks(
 
     # Manually add chunks to ensure they exist for this test.
     chunk_texts = ["Chunk 1.", "Chunk 2.", "Chunk 3."]
-    for i, text in enumerate(chunk_texts):
-        db_session.add(
-            DocumentChunk(
-                document_id=doc_with_chunks.id,
-                chunk_text=text,
-                chunk_order=i,
-                embedding_id=f"mock_embedding_{i}",  # Mock an embedding ID
-            )
-        )
+    # One executemany INSERT, without the unit of work tracking each row
+    await db_session.execute(
+        insert(DocumentChunk),
+        [
+            {
+                "document_id": doc_with_chunks.id,
+                "chunk_text": text,
+                "chunk_order": i,
+                "embedding_id": f"mock_embedding_{i}",  # Mock an embedding ID
+            }
+            for i, text in enumerate(chunk_texts)
+        ],
+    )
     await db_session.commit()  # Commit chunks
-    await db_session.refresh(doc_with_chunks)  # Refresh to load relationships if needed
 
     response = await authenticated_client.get(f"/documents/{doc_with_chunks.id}/chunks")
     assert response.status_code == 200
@@ -249,3 +298,54 @@ async def test_get_document_chunks(
     assert data[1]["chunk_text"] == "Chunk 2."
     assert data[2]["chunk_text"] == "Chunk 3."
     assert data[0]["document_id"] == doc_with_chunks.id
+
+
+@pytest.mark.asyncio
+async def test_get_chunks_non_existent_document(authenticated_client: AsyncClient):
+    """Test retrieving chunks for a non-existent document."""
+    response = await authenticated_client.get("/documents/99999/chunks")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Document not found"
+
+
+@pytest.mark.asyncio
+async def test_create_document_releases_connection_during_embedding(
+    client: AsyncClient, tmp_path, monkeypatch
+):
+    """Test that no pooled connection is checked out while chunks are embedded."""
+    # Sessions come from a pooled engine, as with the real get_db, instead of
+    # the test session pinned to one connection for its rollback
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        user = User(email="pool@example.com", hashed_password="unused")
+        session.add(user)
+        await session.commit()
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: TokenData(
+        id=user.id, email=user.email, is_active=True
+    )
+
+    checked_out = []
+    embed_chunks = documents._embed_chunks
+
+    def recording_embed_chunks(chunks):
+        checked_out.append(engine.pool.checkedout())
+        return embed_chunks(chunks)
+
+    monkeypatch.setattr(documents, "_embed_chunks", recording_embed_chunks)
+    try:
+        response = await client.post(
+            "/documents/", json={"title": "Pooled", "content": "Pooled content"}
+        )
+    finally:
+        await engine.dispose()
+    assert response.status_code == 201
+    assert checked_out == [0]
@@ -0,0 +1,24 @@
+import re
+
+from app.services.mock_doc_system import MockDocumentSystem
+from app.services.vector_store import MockVectorStore
+
+
+def test_mock_ids_are_formatted_and_unique_across_services():
+    """Test mock document and embedding IDs share one prefix and never repeat."""
+    doc_system = MockDocumentSystem()
+    store = MockVectorStore()
+
+    uploads = [doc_system.upload_document(f"Doc {i}", "content") for i in range(3)]
+    doc_ids = [upload["mock_system_id"] for upload in uploads]
+    embedding_ids = store.add_embeddings(store.generate_mock_embeddings(["a", "b"]))
+    embedding_ids.append(store.add_embedding(store.generate_mock_embedding("c")))
+
+    doc_matches = [re.fullmatch(r"mock_doc_([0-9a-f]{16})_(\d+)", i) for i in doc_ids]
+    vec_matches = [re.fullmatch(r"vec_([0-9a-f]{16})_(\d+)", i) for i in embedding_ids]
+    assert all(doc_matches) and all(vec_matches)
+    assert len({m.group(1) for m in doc_matches + vec_matches}) == 1
+    # One counter backs both kinds, so the numeric suffixes never collide either
+    counters = [int(m.group(2)) for m in doc_matches + vec_matches]
+    assert len(set(counters)) == len(counters) == 6
+    assert len(set(doc_ids + embedding_ids)) == 6
@@ -0,0 +1,31 @@
+import numpy as np
+
+from app.services.vector_store import EMBEDDING_SIZE, MockVectorStore
+
+
+def test_add_and_get_embeddings_in_batch():
+    """Test that batched embeddings are stored and retrievable by ID."""
+    store = MockVectorStore()
+    vectors = store.generate_mock_embeddings(["a", "b", "c"])
+    assert vectors.shape == (3, EMBEDDING_SIZE)
+    assert vectors.dtype == np.float32
+
+    embedding_ids = store.add_embeddings(vectors)
+    assert len(set(embedding_ids)) == 3
+    for embedding_id, vector in zip(embedding_ids, vectors):
+        np.testing.assert_array_equal(store.get_embedding(embedding_id), vector)
+
+
+def test_delete_embedding_keeps_remaining_rows_addressable():
+    """Test that deleting a row moves the last row without losing any vector."""
+    store = MockVectorStore()
+    vectors = store.generate_mock_embeddings(["a", "b", "c"])
+    first_id, second_id, third_id = store.add_embeddings(vectors)
+
+    assert store.delete_embedding(first_id) is True
+    assert store.get_embedding(first_id) is None
+    np.testing.assert_array_equal(store.get_embedding(second_id), vectors[1])
+    np.testing.assert_array_equal(store.get_embedding(third_id), vectors[2])
+
+    assert store.delete_embeddings([second_id, third_id, "missing"]) == 2
+    assert store.delete_embedding(second_id) is False